@@ -4,6 +4,7 @@ from draw_trees import *
 # Constants
 ANGLE = 30              # Angle in degrees for drawing branches (30 degrees left/right)
 CORRECTION = 1.155      # Correction factor to adjust horizontal distance calculation
+FONT = ("Arial", 12, "normal")  # Font used to write node values
 
 # Example phylogenetic tree with numeric node values representing heights/distances
 # Structure: (node_value, left_subtree, right_subtree)
@@ -17,40 +18,76 @@ myTree = (5,                              # Root node with value 5
          )
 
 
-def drawPhyloTree2(Tree, scale):
+def precompute_distances(Tree, scale):
+    '''Computes every branch length drawPhyloTree2 will draw, in one pass.
+    
+    A branch is (parent value - child height) * scale * CORRECTION, where
+    a child's height is its value if it is an int and 0 otherwise.
+    
+    Args:
+        Tree: A tuple representing a tree structure (node_value, left_subtree, right_subtree)
+        scale: A scaling factor to adjust the distances between nodes
+    
+    Returns:
+        dict: Maps id(node) to (left_distance, right_distance) for every
+              internal node; a distance is None where the subtree is empty
+    '''
+    distances = {}
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        if not t or len(t) == 1:
+            continue
+        pair = []
+        for child in (t[1], t[2]):
+            if child:
+                child_height = child[0] if isinstance(child[0], int) else 0
+                pair.append((t[0] - child_height) * scale * CORRECTION)
+                stack.append(child)
+            else:
+                pair.append(None)
+        distances[id(t)] = tuple(pair)
+    return distances
+
+
+@bufferedDrawing
+def drawPhyloTree2(Tree, scale, distances=None):
     '''Draws a phylogenetic tree using the turtle graphics module.
     
     Args:
         Tree: A tuple representing a tree structure (node_value, left_subtree, right_subtree)
               where node_value is a number (height/distance) or a string (leaf name)
         scale: A scaling factor to adjust the distances between nodes
+        distances: Table from precompute_distances(Tree, scale); computed
+                   automatically on the top-level call
     '''
     # Base case: empty tree, nothing to draw
     if not Tree:
         return
 
+    # Compute every branch length once, on the top-level call
+    if distances is None:
+        distances = precompute_distances(Tree, scale)
+
     # Write the current node's value (number or name) at the current position
-    turtle.write(str(Tree[0]), font=("Arial", 12, "normal"))
+    turtle.write(str(Tree[0]), font=FONT)
 
     # Base case: leaf node (only has a value, no subtrees)
     if len(Tree) == 1:
         return  # Leaf node: nothing more to draw
 
+    # Look up the precomputed branch lengths to both children
+    left_distance, right_distance = distances[id(Tree)]
+
     # Draw the left subtree
     if Tree[1]:
-        # Get the height value of the left child (if it's a number, otherwise use 0)
-        left_height = Tree[1][0] if isinstance(Tree[1][0], int) else 0
-        # Calculate horizontal distance based on difference between current node and child node
-        horizontal_distance = (Tree[0] - left_height) * scale
-        # Apply correction factor to adjust the distance (accounts for angle geometry)
-        distance_to_move = horizontal_distance * CORRECTION
-
+        distance_to_move = left_distance
         # Turn left by the specified angle to draw left branch
         turtle.left(ANGLE)
         # Move forward by the calculated distance
         turtle.forward(distance_to_move)
         # Recursively draw the left subtree
-        drawPhyloTree2(Tree[1], scale)
+        drawPhyloTree2(Tree[1], scale, distances)
         # Return to the previous position (backtrack)
         turtle.backward(distance_to_move)
         # Turn right to restore original orientation
@@ -58,19 +95,13 @@ def drawPhyloTree2(Tree, scale):
 
     # Draw the right subtree
     if Tree[2]:
-        # Get the height value of the right child (if it's a number, otherwise use 0)
-        right_height = Tree[2][0] if isinstance(Tree[2][0], int) else 0
-        # Calculate horizontal distance based on difference between current node and child node
-        horizontal_distance = (Tree[0] - right_height) * scale
-        # Apply correction factor to adjust the distance (accounts for angle geometry)
-        distance_to_move = horizontal_distance * CORRECTION
-
+        distance_to_move = right_distance
         # Turn right by the specified angle to draw right branch
         turtle.right(ANGLE)
         # Move forward by the calculated distance
         turtle.forward(distance_to_move)
         # Recursively draw the right subtree
-        drawPhyloTree2(Tree[2], scale)
+        drawPhyloTree2(Tree[2], scale, distances)
         # Return to the previous position (backtrack)
         turtle.backward(distance_to_move)
         # Turn left to restore original orientation
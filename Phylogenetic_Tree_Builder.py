@@ -1,6 +1,71 @@
 
 from represent_trees import *
 
+# find, subtree, parent and descendantNodes are memoized per tree with
+# memoized_by_tree from represent_trees, like nodeCount and height.
+
+
+# Sharing identical subtrees.
+# Trees often repeat the same subtree, e.g. many ('X', (), ()) leaves, and
+# a forest of related trees repeats whole clades. cons() returns one shared
+# tuple for every (value, left, right) combination it has seen, so repeated
+# subtrees are stored once and compare equal with a cheap `is` check.
+
+_interned = {}
+_INTERN_LIMIT = 100000   # nodes remembered before the table starts afresh
+
+
+def _cons(table, value, left, right):
+    '''returns the node (value, left, right) shared through table'''
+    # Children are keyed by identity (they are interned themselves), and
+    # the value's type is part of the key so 1, 1.0 and True stay distinct.
+    # Each stored node holds its children, so their ids stay valid.
+    key = (type(value), value, id(left), id(right))
+    try:
+        return table.setdefault(key, (value, left, right))
+    except TypeError:  # unhashable value: cannot be shared
+        return (value, left, right)
+
+
+def cons(value, left, right):
+    '''returns the shared tree node (value, left, right)'''
+    # Keep the table bounded: once full, start it afresh. Nodes handed out
+    # earlier stay valid; they are just not shared with later ones.
+    if len(_interned) >= _INTERN_LIMIT:
+        _interned.clear()
+    return _cons(_interned, value, left, right)
+
+
+def intern_tree(Tree):
+    '''returns a copy of Tree in which identical subtrees are one shared object'''
+    # Postorder walk: each node is rebuilt with cons() after its children;
+    # `built` holds the rebuilt children until their parent is reached
+    built = []
+    stack = [(Tree, False)]
+    while stack:
+        t, expanded = stack.pop()
+        if not t or len(t) != 3:
+            built.append(t)
+        elif expanded:
+            right = built.pop()
+            left = built.pop()
+            built.append(cons(t[0], left, right))
+        else:
+            stack.append((t, True))
+            stack.append((t[2], False))
+            stack.append((t[1], False))
+    return built.pop()
+
+
+def clear_tree_caches():
+    '''forgets all cached query results, measurements and shared subtrees (releasing
+the trees they hold). Only needed to free memory, or if a flattened tree's
+arrays are modified in place.'''
+    _interned.clear()
+    clear_stats_cache()
+    _scale_memo[:] = [None, frozenset()]
+
+
 # Write the following functions:
 
 # Problem 1. leafCount(Tree)
@@ -9,14 +74,31 @@ from represent_trees import *
 
 def leafCount(Tree):
     '''counts the number of leaf nodes in the tree.'''
-    # Base case: empty tree has no leaves
-    if not Tree:
-        return 0
-    # Base case: leaf node (both left and right subtrees are empty)
-    if not Tree[1] and not Tree[2]:  # If both left and right subtrees are empty
-        return 1
-    # Recursive case: count leaves in left subtree plus leaves in right subtree
-    return leafCount(Tree[1]) + leafCount(Tree[2])
+    # A TreeInfo lists leaves by leafList's rule (stop at an empty left
+    # subtree), which can differ from the count here, so count its tree
+    if isinstance(Tree, TreeInfo):
+        Tree = Tree.tree
+    # Flattened trees are counted with a compiled loop over the arrays
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.leaf_count_flat(Tree)
+    # Walk the tree with an explicit stack so deep trees cannot exceed
+    # Python's recursion limit
+    count = 0
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        # Empty subtree has no leaves
+        if not t:
+            continue
+        # Leaf node (written as (name,), or both subtrees are empty)
+        if len(t) == 1 or (not t[1] and not t[2]):
+            count += 1
+        else:
+            # Count leaves in the left and right subtrees
+            stack.append(t[2])
+            stack.append(t[1])
+    return count
 
 
 # Problem 2. find(node, Tree)
@@ -24,17 +106,25 @@ def leafCount(Tree):
 # False otherwise. 
 
 
+@memoized_by_tree(tree_arg=1)
 def find(node, Tree):
     '''checks if a node is present in the tree'''
-    # Base case: empty tree doesn't contain the node
-    if not Tree:
-        return False
-    # Base case: found the node at the current root
-    if Tree[0] == node:
-        return True
-    # Recursive case: search in left subtree OR right subtree
-    # Returns True if found in either subtree, False otherwise
-    return find(node, Tree[1]) or find(node, Tree[2])
+    # Iterative depth-first search with an explicit stack, so deep trees
+    # cannot exceed Python's recursion limit
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        # Empty subtree doesn't contain the node
+        if not t:
+            continue
+        # Found the node at the current root
+        if t[0] == node:
+            return True
+        # Push right first so the left subtree is searched first
+        if len(t) == 3:
+            stack.append(t[2])
+            stack.append(t[1])
+    return False
 
 
 # Problem 3. subtree(node, Tree)
@@ -42,20 +132,23 @@ def find(node, Tree):
 # Said another way, this function returns the tree beginning at node.
 
 
+@memoized_by_tree(tree_arg=1)
 def subtree(node, Tree):
     '''returns the subtree rooted at the given node'''
-    # Base case: empty tree doesn't contain the node
-    if not Tree:
-        return None
-    # Base case: found the node, return the entire subtree rooted here
-    if Tree[0] == node:
-        return Tree
-    # Recursive case: search in left subtree first
-    left_subtree = subtree(node, Tree[1])
-    if left_subtree:
-        return left_subtree
-    # If not found in left subtree, search in right subtree
-    return subtree(node, Tree[2])
+    # Iterative depth-first search, left subtree before right subtree
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        # Empty subtree doesn't contain the node
+        if not t:
+            continue
+        # Found the node, return the entire subtree rooted here
+        if t[0] == node:
+            return t
+        if len(t) == 3:
+            stack.append(t[2])
+            stack.append(t[1])
+    return None
 
 
 # Problem 4. nodeList(Tree)
@@ -65,12 +158,25 @@ def subtree(node, Tree):
 
 def nodeList(Tree):
     ''' returns a list of all nodes in the tree'''
-    # Base case: empty tree has no nodes
-    if not Tree:
-        return []
-    # Recursive case: combine current node with nodes from left and right subtrees
-    # Returns list with root node first, followed by all nodes from subtrees
-    return [Tree[0]] + nodeList(Tree[1]) + nodeList(Tree[2])
+    # Flattened trees are walked with a compiled loop over the arrays
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.node_list_flat(Tree)
+    # Preorder walk with an explicit stack, appending to one output list
+    # instead of concatenating the lists of every subtree
+    nodes = []
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        # Empty subtree has no nodes
+        if not t:
+            continue
+        # Root node first, followed by all nodes from the left then right subtree
+        nodes.append(t[0])
+        if len(t) == 3:
+            stack.append(t[2])
+            stack.append(t[1])
+    return nodes
 
 
 # Problem 5. descendantNodes(node, Tree)
@@ -81,11 +187,32 @@ def nodeList(Tree):
 
 def descendantNodes(node, Tree):
     '''returns a list of all descendant nodes of the given node'''
+    # The cached result is a tuple; hand back a fresh list each time so
+    # callers can modify it without corrupting the cache
+    return list(_descendantNodes(node, Tree))
+
+
+@memoized_by_tree(tree_arg=1)
+def _descendantNodes(node, Tree):
+    '''descendants of the given node as a tuple (cached)'''
+    # Flattened trees are walked with a compiled loop over the arrays
+    flat = flat_module(Tree)
+    if flat is not None:
+        return tuple(flat.descendants_flat(Tree, node))
     # First, find the subtree rooted at the given node
     sub_tree = subtree(node, Tree)
-    # Get all nodes in that subtree and exclude the node itself (first element)
-    # Returns all descendants (children, grandchildren, etc.) but not the node
-    return nodeList(sub_tree)[1:]  # Exclude the node itself
+    return tuple(_childNodes(sub_tree))
+
+
+def _childNodes(sub_tree):
+    '''all nodes below the root of sub_tree, in preorder'''
+    if not sub_tree or len(sub_tree) == 1:
+        return []
+    # Collect the left then right subtree into one list, rather than
+    # listing the whole subtree and copying all but its first element
+    nodes = nodeList(sub_tree[1])
+    nodes.extend(nodeList(sub_tree[2]))
+    return nodes
 
 
 # Problem 6. parent(node, Tree)
@@ -93,20 +220,25 @@ def descendantNodes(node, Tree):
 # in the tree, the function should return the special value None. 
 
 
+@memoized_by_tree(tree_arg=1)
 def parent(node, Tree, parent_node=None):
     '''returns the parent of the given node in the tree'''
-    # Base case: empty tree doesn't contain the node
-    if not Tree:
-        return None
-    # Base case: found the node, return its parent (stored in parent_node parameter)
-    if Tree[0] == node:
-        return parent_node
-    # Recursive case: search in left subtree, passing current node as potential parent
-    left_parent = parent(node, Tree[1], Tree[0])
-    if left_parent is not None:
-        return left_parent
-    # If not found in left subtree, search in right subtree, passing current node as potential parent
-    return parent(node, Tree[2], Tree[0])
+    # Iterative depth-first search; each stack entry pairs a subtree with
+    # the value of its parent
+    stack = [(Tree, parent_node)]
+    while stack:
+        t, p = stack.pop()
+        # Empty subtree doesn't contain the node
+        if not t:
+            continue
+        # Found the node, return its parent
+        if t[0] == node:
+            return p
+        # Push right first so the left subtree is searched first
+        if len(t) == 3:
+            stack.append((t[2], t[0]))
+            stack.append((t[1], t[0]))
+    return None
 
 
 # Problem 7. scale(Tree,scaleFactor)
@@ -114,23 +246,115 @@ def parent(node, Tree, parent_node=None):
 # by scaleFactor, and returns a new tree with those values. 
 
 
+# Trees are often rescaled repeatedly. scale() remembers, for the last
+# tree it scaled, which subtrees contain no numbers at all; the next call
+# on the same tree shares those subtrees without walking into them or
+# type-checking their values again.
+
+_scale_memo = [None, frozenset()]   # [tree, ids of number-free subtrees]
+
+
 def scale(Tree, scaleFactor):
     '''takes a Tree as input, and multiplies the numbers at its
 internal nodes by scaleFactor and returns a new tree with those values'''
-    # Base case: empty tree, return as-is
-    if not Tree:
-        return Tree
-    # Unpack the tree into its components: value, left subtree, right subtree
-    value, left, right = Tree
-    # Only scale if the value is numeric (internal node), not a string (leaf node)
-    if isinstance(value, (int, float)): # Check if current node is internal node
-        value *= scaleFactor
-        
-    # Recursively scale the left and right subtrees
-    left_scaled = scale(left, scaleFactor)
-    right_scaled = scale(right, scaleFactor)
-    
-    # Return a new tree with scaled values, preserving the tree structure
-    return (value, left_scaled, right_scaled)
+    # Flattened trees are scaled with one vectorized multiply
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.scale_flat(Tree, scaleFactor)
+    known = _scale_memo[1] if _scale_memo[0] is Tree else frozenset()
+    unchanged = set()
+    # Identical scaled subtrees share one tuple. The table only lives for
+    # this call, so scaled trees are not kept after the caller drops them.
+    shared = {}
+    # Postorder walk with an explicit stack: each node is rebuilt after its
+    # children; `built` holds the rebuilt children until their parent is
+    # reached
+    built = []
+    stack = [(Tree, False)]
+    while stack:
+        t, expanded = stack.pop()
+        # Empty tree, or a subtree already known to contain no numbers:
+        # keep as-is
+        if not t or id(t) in known:
+            built.append(t)
+        elif len(t) != 3:
+            # Leaf written as (name,): scale it only if it is a number
+            built.append((t[0] * scaleFactor,) if isinstance(t[0], (int, float)) else t)
+        elif expanded:
+            # Unpack the tree into its components: value, left subtree, right subtree
+            value, left, right = t
+            right_scaled = built.pop()
+            left_scaled = built.pop()
+            # Only scale if the value is numeric (internal node), not a string (leaf node)
+            if isinstance(value, (int, float)):
+                built.append(_cons(shared, value * scaleFactor, left_scaled, right_scaled))
+            elif left_scaled is left and right_scaled is right:
+                # Nothing in this subtree changed: share the original
+                # subtree instead of copying it
+                built.append(t)
+                continue
+            else:
+                # Return a new node with scaled subtrees; identical scaled
+                # subtrees share one tuple
+                built.append(_cons(shared, value, left_scaled, right_scaled))
+            # This node changed; remember which of its children did not
+            if left and left_scaled is left:
+                unchanged.add(id(left))
+            if right and right_scaled is right:
+                unchanged.add(id(right))
+        else:
+            stack.append((t, True))
+            stack.append((t[2], False))
+            stack.append((t[1], False))
+    result = built.pop()
+    if result is Tree:
+        unchanged.add(id(Tree))
+    # Holding a reference to Tree keeps the remembered ids valid
+    if _scale_memo[0] is not Tree:
+        _scale_memo[:] = [Tree, frozenset(unchanged)]
+    return result
+
+
+# Repeated queries on the same tree.
+# find, subtree and parent each scan the whole tree. When many queries are
+# made against one tree, IndexedTree does a single scan up front and then
+# answers each query with a dictionary lookup.
+
+
+class IndexedTree:
+    '''answers find/subtree/parent/descendantNodes queries on one tree
+using an index built once'''
+
+    def __init__(self, Tree):
+        self.tree = Tree
+        # Maps node value -> (subtree rooted at that node, parent value)
+        self._index = {}
+        # Preorder walk, left before right, so that for repeated values
+        # the first match is kept, just like the scanning functions
+        stack = [(Tree, None)]
+        while stack:
+            t, p = stack.pop()
+            if not t:
+                continue
+            self._index.setdefault(t[0], (t, p))
+            if len(t) == 3:
+                stack.append((t[2], t[0]))
+                stack.append((t[1], t[0]))
+
+    def find(self, node):
+        '''checks if a node is present in the tree'''
+        return node in self._index
+
+    def subtree(self, node):
+        '''returns the subtree rooted at the given node'''
+        entry = self._index.get(node)
+        return entry[0] if entry else None
 
+    def parent(self, node):
+        '''returns the parent of the given node in the tree'''
+        entry = self._index.get(node)
+        return entry[1] if entry else None
 
+    def descendantNodes(self, node):
+        '''returns a list of all descendant nodes of the given node'''
+        return _childNodes(self.subtree(node))
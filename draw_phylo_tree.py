@@ -4,13 +4,24 @@ This module implements the drawPhyloTree() function that was mentioned
 but not implemented in draw_trees.py. This function draws phylogenetic
 trees using turtle graphics, writing only leaf node names.
 
+For saving trees to image files, drawPhyloTree() can also render with
+Cairo (backend="cairo"), which needs the optional pycairo package.
+
 Based on Section 10.2 (pp. 159 - 161) of CFB Chapter 10.
 """
 
+import math
 import turtle
 
+from draw_trees import bufferedDrawing
+
+try:
+    import cairo
+except ImportError:  # pycairo is optional; only render_cairo needs it
+    cairo = None
 
-def drawPhyloTree(Tree, branch_length=50, angle=30):
+
+def drawPhyloTree(Tree, branch_length=50, angle=30, backend="turtle", surface=None):
     """Draws a phylogenetic tree, writing leaf node names only.
     
     This function draws a phylogenetic tree using turtle graphics.
@@ -24,6 +35,13 @@ def drawPhyloTree(Tree, branch_length=50, angle=30):
               Empty subtrees are represented as ()
         branch_length: Length of branches to draw (default: 50)
         angle: Angle for branch turns in degrees (default: 30)
+        backend: "turtle" (default) to draw on screen, or "cairo" to
+                 render onto a Cairo surface with render_cairo()
+        surface: The cairo.Surface to draw on (required for backend="cairo")
+    
+    Raises:
+        ValueError: If backend is not "turtle" or "cairo", or if backend
+            is "cairo" and no surface is given
     
     Examples:
         >>> import turtle
@@ -34,6 +52,17 @@ def drawPhyloTree(Tree, branch_length=50, angle=30):
         >>> drawPhyloTree(smallTree, branch_length=80, angle=45)
         >>> turtle.done()
     """
+    if backend == "cairo":
+        render_cairo(Tree, surface, branch_length, angle)
+    elif backend == "turtle":
+        _drawPhyloTreeTurtle(Tree, branch_length, angle)
+    else:
+        raise ValueError(f"backend must be 'turtle' or 'cairo', got {backend!r}")
+
+
+@bufferedDrawing
+def _drawPhyloTreeTurtle(Tree, branch_length, angle):
+    """Turtle implementation of drawPhyloTree (see its docstring)."""
     # Base case: empty tree, nothing to draw
     if not Tree:
         return
@@ -64,7 +93,7 @@ def drawPhyloTree(Tree, branch_length=50, angle=30):
         turtle.forward(branch_length)
         # Recursively draw the left subtree with slightly shorter branches
         # This creates a natural tapering effect as we go deeper
-        drawPhyloTree(Tree[1], branch_length * 0.8, angle)
+        _drawPhyloTreeTurtle(Tree[1], branch_length * 0.8, angle)
         # Return to the previous position (backtrack)
         turtle.backward(branch_length)
         # Turn right to restore original orientation
@@ -77,13 +106,14 @@ def drawPhyloTree(Tree, branch_length=50, angle=30):
         # Move forward by the branch length
         turtle.forward(branch_length)
         # Recursively draw the right subtree with slightly shorter branches
-        drawPhyloTree(Tree[2], branch_length * 0.8, angle)
+        _drawPhyloTreeTurtle(Tree[2], branch_length * 0.8, angle)
         # Return to the previous position (backtrack)
         turtle.backward(branch_length)
         # Turn left to restore original orientation
         turtle.left(angle)
 
 
+@bufferedDrawing
 def drawPhyloTree_with_labels(Tree, branch_length=50, angle=30, show_internal=True):
     """Draws a phylogenetic tree with optional internal node labels.
     
@@ -142,6 +172,104 @@ def drawPhyloTree_with_labels(Tree, branch_length=50, angle=30, show_internal=Tr
         turtle.backward(10)
 
 
+def _phyloTreeLayout(Tree, branch_length, angle):
+    """Computes the geometry drawPhyloTree would produce, without drawing.
+    
+    Follows the same moves as the turtle version, starting at (0, 0)
+    facing east with y pointing up.
+    
+    Returns:
+        tuple: (segments, labels) where segments is a list of
+            ((x0, y0), (x1, y1)) branch lines and labels is a list of
+            (x, y, text) leaf names
+    """
+    segments = []
+    labels = []
+    # Each stack entry: (subtree, x, y, heading in degrees, branch length)
+    stack = [(Tree, 0.0, 0.0, 0.0, branch_length)]
+    while stack:
+        t, x, y, heading, length = stack.pop()
+        if not t:
+            continue
+        # Leaf node: record its name at the current position
+        if len(t) == 1 or (not t[1] and not t[2]):
+            labels.append((x, y, str(t[0])))
+            continue
+        # Internal node: a branch to each non-empty subtree, turning left
+        # for the left subtree and right for the right subtree
+        for child, turn in ((t[1], angle), (t[2], -angle)):
+            if child:
+                h = heading + turn
+                x1 = x + length * math.cos(math.radians(h))
+                y1 = y + length * math.sin(math.radians(h))
+                segments.append(((x, y), (x1, y1)))
+                stack.append((child, x1, y1, h, length * 0.8))
+    return segments, labels
+
+
+def render_cairo(Tree, surface, branch_length=50, angle=30, margin=20):
+    """Renders a phylogenetic tree onto a Cairo surface.
+    
+    Produces the same picture as drawPhyloTree (leaf names only), but all
+    branches are collected into a single path and stroked with one call,
+    which is much faster than turtle for large trees. The drawing is
+    placed so its top-left corner sits margin pixels from the surface's.
+
+    test_draw_phylo_tree.py renders with pycairo when it is installed and
+    is skipped otherwise.
+    
+    Args:
+        Tree: A tuple representing a tree structure (node_name, left_subtree, right_subtree)
+        surface: The cairo.Surface to draw on (e.g. cairo.ImageSurface)
+        branch_length: Length of the first branches (default: 50)
+        angle: Angle for branch turns in degrees (default: 30)
+        margin: Space in pixels around the drawing (default: 20)
+    
+    Raises:
+        ValueError: If surface is None
+        ImportError: If pycairo is not installed
+    
+    Examples:
+        >>> import cairo
+        >>> from draw_phylo_tree import render_cairo
+        >>> from represent_trees import smallTree
+        >>> 
+        >>> surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 400, 300)
+        >>> render_cairo(smallTree, surface, branch_length=80, angle=45)
+        >>> surface.write_to_png("tree.png")
+    """
+    if surface is None:
+        raise ValueError("render_cairo needs a cairo.Surface to draw on, got None")
+    if cairo is None:
+        raise ImportError(
+            "render_cairo requires pycairo; install it with: pip install pycairo"
+        )
+
+    segments, labels = _phyloTreeLayout(Tree, branch_length, angle)
+    points = [p for seg in segments for p in seg] + [(x, y) for x, y, _ in labels]
+    if not points:
+        return
+    # Cairo's y axis points down, so flip y and shift into the margin
+    dx = margin - min(x for x, _ in points)
+    top = max(y for _, y in points) + margin
+
+    ctx = cairo.Context(surface)
+    ctx.set_source_rgb(0, 0, 0)
+    ctx.set_line_width(1)
+
+    # All branches go into one path, stroked once
+    for (x0, y0), (x1, y1) in segments:
+        ctx.move_to(x0 + dx, top - y0)
+        ctx.line_to(x1 + dx, top - y1)
+    ctx.stroke()
+
+    ctx.select_font_face("Arial", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+    ctx.set_font_size(12)
+    for x, y, text in labels:
+        ctx.move_to(x + dx, top - y)
+        ctx.show_text(text)
+
+
 # Example usage and test function
 if __name__ == "__main__":
     # Import example tree
@@ -28,6 +28,38 @@
 # base Python, it must be imported, as follows:
 
 import turtle
+from functools import wraps
+
+# Drawing many short lines is slow because turtle
+# refreshes the window after every move. The helper
+# below switches refreshing off while a (recursive)
+# drawing function runs and shows the finished
+# picture with a single update at the end.
+
+def bufferedDrawing(drawFunction):
+    '''Decorates a drawing function so the screen is updated only once.'''
+    depth = 0
+
+    @wraps(drawFunction)
+    def wrapper(*args, **kwargs):
+        nonlocal depth
+        # Recursive calls draw into the already-buffered screen
+        if depth > 0:
+            return drawFunction(*args, **kwargs)
+        # Outermost call: remember the settings, then turn refreshing off
+        oldTracer = turtle.tracer()
+        oldDelay = turtle.delay()
+        turtle.tracer(0, 0)
+        depth += 1
+        try:
+            return drawFunction(*args, **kwargs)
+        finally:
+            depth -= 1
+            # Show the whole drawing at once and restore the settings
+            turtle.update()
+            turtle.tracer(oldTracer, oldDelay)
+
+    return wrapper
 
 # Now let's write a function that uses two functions
 # in the turtle library to draw a square:
@@ -63,6 +95,7 @@ def square(sideLength):
 # function that can draw a fractal tree, as shown
 # on the bottom of p. 158, in Fig. 10.4.
 
+@bufferedDrawing
 def fractalTree(trunkLength):
     '''Draws a tree, recursively, given a trunk length.'''
     # Base case: stop recursion if trunk is too short
@@ -0,0 +1,746 @@
+"""Flat (structure-of-arrays) tree representation.
+
+The tuple trees used throughout this project are convenient to write by
+hand, but every traversal has to chase nested tuples one Python object at
+a time. This module converts a tuple tree into parallel NumPy arrays, so
+traversals become simple index loops over contiguous memory.
+
+Layout of a flattened tree with n nodes:
+    value_num:  float64 array, the node value where it is a float, else NaN
+    value_int:  int64 array, the node value where it is an int, else 0
+    value_str:  object array, the node value where it is not a number, else None
+    is_numeric: bool array, True where the node value is an int or float
+    is_float:   bool array, True where the node value is a float
+    left_idx:   int32 array, index of the left child or -1
+    right_idx:  int32 array, index of the right child or -1
+    parent_idx: int32 array, index of the parent or -1 for the root
+
+Nodes are stored in postorder: every subtree occupies a contiguous run of
+indices ending with its own root, and the tree's root is the last entry.
+flatten() stores the larger of each node's two subtrees last, so its root
+sits right next to the parent in memory. Because of this the array order
+is not necessarily left-to-right; functions that return node values walk
+the left/right index arrays to produce the same order as the tuple
+functions.
+
+Numbers and names live in separate arrays so that numeric work such as
+scaling runs over plain numeric arrays. Ints and floats are kept apart,
+so values come back exactly as they went in (2 stays 2, 2.0 stays 2.0)
+and large ints keep every digit. Ints must fit in 64 bits. Bools are
+stored as ints (as scale treats them) and come back as 1 and 0.
+
+Functions:
+    flatten: Builds a SoATree from a tuple tree (one-time cost)
+    unflatten: Converts a SoATree back into a tuple tree
+    node_count_flat: Number of nodes in a flattened tree
+    height_flat: Height of a flattened tree
+    leaf_count_flat: Number of leaves in a flattened tree
+    leaf_mask_flat: Bool array marking the leaves of a flattened tree
+    node_list_flat: Node values of a flattened tree, in preorder
+    leaf_list_flat: Leaf values of a flattened tree, left to right
+    descendants_flat: Descendant values of a node, in preorder
+    scale_flat: Multiplies the numeric node values by a scale factor
+    parse_newick_to_soa: Builds a SoATree directly from Newick text
+    load_tree: Reads a Newick file into a SoATree
+
+NumPy is optional for the rest of the project; it is only required here.
+If Numba is installed, the index loops are JIT-compiled to machine code,
+and loops whose iterations are independent run on all CPU cores. Without
+Numba, the height and leaf queries use whole-array NumPy operations
+instead, and the remaining loops run as ordinary Python over the arrays.
+"""
+
+import math
+import re
+from numbers import Number
+from typing import Any, List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    _HAVE_NUMBA = False
+
+    def njit(**kwargs):
+        """Stand-in for numba.njit that leaves the function unchanged."""
+        return lambda func: func
+
+    prange = range
+
+
+class SoATree(NamedTuple):
+    """A tree stored as parallel arrays in postorder (see module docstring)."""
+    value_num: Any
+    value_int: Any
+    value_str: Any
+    is_numeric: Any
+    is_float: Any
+    left_idx: Any
+    right_idx: Any
+    parent_idx: Any
+
+    @classmethod
+    def from_tuple(cls, Tree: Tuple) -> "SoATree":
+        """Same as flatten(Tree)."""
+        return flatten(Tree)
+
+    def to_tuple(self) -> Tuple:
+        """Same as unflatten(self)."""
+        return unflatten(self)
+
+
+def _require_numpy() -> None:
+    """Raises ImportError with a helpful message if NumPy is missing."""
+    if np is None:
+        raise ImportError(
+            "flat_tree requires NumPy; install it with: pip install numpy"
+        )
+
+
+def _subtree_sizes(Tree: Tuple) -> dict:
+    """Returns a dict mapping id(subtree) to its number of nodes."""
+    sizes = {}
+    stack = [(Tree, False)]
+    while stack:
+        t, expanded = stack.pop()
+        if not t or id(t) in sizes:
+            continue
+        if len(t) != 3:
+            sizes[id(t)] = 1
+        elif expanded:
+            sizes[id(t)] = 1 + sizes.get(id(t[1]), 0) + sizes.get(id(t[2]), 0)
+        else:
+            stack.append((t, True))
+            stack.append((t[1], False))
+            stack.append((t[2], False))
+    return sizes
+
+
+def _store_int(value_int, i, value) -> None:
+    """Stores an int node value, with a clear error if it needs more than 64 bits."""
+    try:
+        value_int[i] = value
+    except OverflowError:
+        raise OverflowError(
+            f"Node value {value} does not fit in 64 bits; flat trees store ints as int64"
+        ) from None
+
+
+def flatten(Tree: Tuple) -> SoATree:
+    """Converts a tuple tree into a SoATree.
+
+    Leaves may be written as (name, (), ()) or (name,). Empty subtrees
+    are stored as -1 in the child index arrays.
+
+    Args:
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+
+    Returns:
+        SoATree: The same tree as parallel arrays in postorder
+
+    Examples:
+        >>> flat = flatten(('A', ('B', (), ()), ('C', (), ())))
+        >>> flat.value_str.tolist()
+        ['B', 'C', 'A']
+        >>> flat.left_idx.tolist(), flat.right_idx.tolist()
+        ([-1, -1, 0], [-1, -1, 1])
+    """
+    _require_numpy()
+
+    # First pass: subtree sizes, used both to allocate the arrays once and
+    # to decide which child to store next to its parent
+    sizes = _subtree_sizes(Tree)
+    n = sizes.get(id(Tree), 0)
+
+    value_num = np.full(n, np.nan, dtype=np.float64)
+    value_int = np.zeros(n, dtype=np.int64)
+    value_str = np.empty(n, dtype=object)
+    is_numeric = np.zeros(n, dtype=bool)
+    is_float = np.zeros(n, dtype=bool)
+    left_idx = np.full(n, -1, dtype=np.int32)
+    right_idx = np.full(n, -1, dtype=np.int32)
+    parent_idx = np.full(n, -1, dtype=np.int32)
+
+    # Second pass: postorder fill. A node is stored after both of its
+    # children; `done` holds the indices of stored subtree roots so the
+    # parent can pick up its children's indices.
+    i = 0
+    done = []
+    stack = [(Tree, False, True)]
+    while stack:
+        t, expanded, left_first = stack.pop()
+        if not t:
+            continue
+
+        if not expanded:
+            if len(t) != 3:
+                stack.append((t, True, True))
+                continue
+            # Store the smaller subtree first and the larger one last,
+            # right before the parent. Ties keep left before right.
+            left_first = sizes.get(id(t[1]), 0) <= sizes.get(id(t[2]), 0)
+            stack.append((t, True, left_first))
+            if left_first:
+                stack.append((t[2], False, True))
+                stack.append((t[1], False, True))
+            else:
+                stack.append((t[1], False, True))
+                stack.append((t[2], False, True))
+            continue
+
+        has_left = len(t) == 3 and bool(t[1])
+        has_right = len(t) == 3 and bool(t[2])
+        # Children were stored in emission order, so the last one is on top
+        if has_left and has_right:
+            last = done.pop()
+            first = done.pop()
+            li, ri = (first, last) if left_first else (last, first)
+        elif has_left:
+            li, ri = done.pop(), -1
+        elif has_right:
+            li, ri = -1, done.pop()
+        else:
+            li, ri = -1, -1
+
+        left_idx[i] = li
+        right_idx[i] = ri
+        if li != -1:
+            parent_idx[li] = i
+        if ri != -1:
+            parent_idx[ri] = i
+        if isinstance(t[0], float):
+            value_num[i] = t[0]
+            is_numeric[i] = True
+            is_float[i] = True
+        elif isinstance(t[0], int):
+            _store_int(value_int, i, t[0])
+            is_numeric[i] = True
+        else:
+            value_str[i] = t[0]
+        done.append(i)
+        i += 1
+
+    return SoATree(value_num, value_int, value_str, is_numeric, is_float,
+                   left_idx, right_idx, parent_idx)
+
+
+def unflatten(flat: SoATree) -> Tuple:
+    """Converts a SoATree back into a tuple tree.
+
+    Leaves come back as (name, (), ()), including ones that were written
+    as (name,) before flattening.
+
+    Args:
+        flat: A SoATree built with flatten() or parse_newick_to_soa()
+
+    Returns:
+        tuple: The tree as (node_name, left_subtree, right_subtree),
+            or () for an empty tree
+
+    Examples:
+        >>> unflatten(flatten(('A', ('B', (), ()), ('C', (), ()))))
+        ('A', ('B', (), ()), ('C', (), ()))
+    """
+    n = len(flat.parent_idx)
+    if n == 0:
+        return ()
+    values = _values(flat, np.arange(n))
+    # Children are stored before their parents, so one forward pass can
+    # build every subtree from subtrees that are already built
+    built = [None] * n
+    for i, (value, li, ri) in enumerate(
+        zip(values, flat.left_idx.tolist(), flat.right_idx.tolist())
+    ):
+        built[i] = (
+            value,
+            built[li] if li != -1 else (),
+            built[ri] if ri != -1 else (),
+        )
+    return built[-1]
+
+
+@njit(cache=True)
+def _height(parent):
+    """Height kernel over the parent index array (see height_flat)."""
+    n = parent.size
+    depth = np.zeros(n, dtype=np.int32)
+    h = 0
+    # Parents are stored after their children, so walk back from the root
+    for i in range(n - 2, -1, -1):
+        depth[i] = depth[parent[i]] + 1
+        if depth[i] > h:
+            h = depth[i]
+    return h
+
+
+@njit(cache=True, parallel=True)
+def _leaf_count(left, right):
+    """Counts the nodes with no children.
+
+    Every node is checked independently, so the loop is split across CPU
+    cores (Numba turns the += into a per-thread sum combined at the end).
+    """
+    n = 0
+    for i in prange(left.size):
+        if left[i] == -1 and right[i] == -1:
+            n += 1
+    return n
+
+
+@njit(cache=True, parallel=True)
+def _leaf_mask(left, right):
+    """Marks the nodes with no children, checking all nodes in parallel."""
+    mask = np.empty(left.size, dtype=np.bool_)
+    for i in prange(left.size):
+        mask[i] = left[i] == -1 and right[i] == -1
+    return mask
+
+
+def _height_vectorized(parent):
+    """Height from the parent array using whole-array NumPy operations.
+
+    Used instead of the _height loop when Numba is not installed. Each
+    node keeps a jump target (initially its parent) and its distance to
+    that target; every round adds the target's distance and jumps to the
+    target's target. Jumps double in length each round, so a tree of
+    height h needs about log2(h) rounds.
+    """
+    dist = (parent != -1).astype(np.int64)
+    jump = parent.astype(np.intp)
+    active = np.flatnonzero(jump != -1)
+    while active.size:
+        up = jump[active]
+        # Read both arrays before writing so every node uses the values
+        # from the previous round
+        dist_up = dist[up]
+        jump_up = jump[up]
+        dist[active] += dist_up
+        jump[active] = jump_up
+        active = active[jump_up != -1]
+    return int(dist.max())
+
+
+@njit(cache=True)
+def _depths(parent):
+    """Depth of every node below the root (see height_flat)."""
+    n = parent.size
+    depth = np.zeros(n, dtype=np.int32)
+    for i in range(n - 2, -1, -1):
+        depth[i] = depth[parent[i]] + 1
+    return depth
+
+
+@njit(cache=True)
+def _hidden(left, parent):
+    """Marks the nodes below a node whose left subtree is empty (see _pruned)."""
+    n = parent.size
+    hidden = np.zeros(n, dtype=np.bool_)
+    # Parents are stored after their children, so walk back from the root
+    for i in range(n - 2, -1, -1):
+        p = parent[i]
+        hidden[i] = hidden[p] or left[p] == -1
+    return hidden
+
+
+def _pruned(flat: SoATree):
+    """Returns a bool array marking the nodes that nodeCount, height and
+    leafList never reach, or None if there are none.
+
+    Those functions treat a node whose left subtree is empty as a leaf
+    and do not look at its right subtree, e.g. ('B', (), ()) in
+    ('A', (), ('B', (), ())). The flat versions skip the same nodes.
+    """
+    if not np.any((flat.left_idx == -1) & (flat.right_idx != -1)):
+        return None
+    return _hidden(flat.left_idx, flat.parent_idx)
+
+
+@njit(cache=True)
+def _preorder(left, right, root):
+    """Returns the indices of the subtree at root in preorder, left first."""
+    order = np.empty(left.size, dtype=np.int32)
+    stack = np.empty(left.size, dtype=np.int32)
+    top = 0
+    stack[0] = root
+    count = 0
+    while top >= 0:
+        i = stack[top]
+        top -= 1
+        order[count] = i
+        count += 1
+        if right[i] != -1:
+            top += 1
+            stack[top] = right[i]
+        if left[i] != -1:
+            top += 1
+            stack[top] = left[i]
+    return order[:count]
+
+
+def _values(flat: SoATree, idx) -> List:
+    """Returns the node values at the given indices as a Python list."""
+    out = flat.value_str[idx]
+    floats = flat.is_float[idx]
+    ints = flat.is_numeric[idx] & ~floats
+    # tolist() turns the NumPy numbers into plain Python ints and floats
+    if ints.any():
+        out[ints] = flat.value_int[idx][ints].tolist()
+    if floats.any():
+        out[floats] = flat.value_num[idx][floats].tolist()
+    return out.tolist()
+
+
+def node_count_flat(flat: SoATree) -> int:
+    """Returns the number of nodes in a flattened tree, counted as nodeCount does."""
+    hidden = _pruned(flat)
+    if hidden is None:
+        return len(flat.parent_idx)
+    return len(flat.parent_idx) - int(np.count_nonzero(hidden))
+
+
+def height_flat(flat: SoATree) -> int:
+    """Returns the height of a flattened tree (0 for a single leaf).
+
+    Every parent is stored after its children, so one backward pass
+    computing depth[i] = depth[parent[i]] + 1 suffices.
+    """
+    if len(flat.parent_idx) == 0:
+        return 0
+    hidden = _pruned(flat)
+    if hidden is not None:
+        # Only the nodes that height() reaches on the tuple tree count
+        return int(_depths(flat.parent_idx)[~hidden].max())
+    if not _HAVE_NUMBA:
+        return _height_vectorized(flat.parent_idx)
+    return int(_height(flat.parent_idx))
+
+
+def leaf_count_flat(flat: SoATree) -> int:
+    """Returns the number of leaves in a flattened tree."""
+    if not _HAVE_NUMBA:
+        return int(np.count_nonzero(leaf_mask_flat(flat)))
+    return int(_leaf_count(flat.left_idx, flat.right_idx))
+
+
+def leaf_mask_flat(flat: SoATree):
+    """Returns a bool array that is True at the array index of every node
+    with no children (the leaves that leafCount counts)."""
+    if not _HAVE_NUMBA:
+        return (flat.left_idx == -1) & (flat.right_idx == -1)
+    return _leaf_mask(flat.left_idx, flat.right_idx)
+
+
+def node_list_flat(flat: SoATree, stop_at_leaves: bool = False) -> List:
+    """Returns the node values of a flattened tree in preorder.
+
+    With stop_at_leaves, nodes that nodeCount would not reach (below a
+    node whose left subtree is empty) are left out.
+    """
+    n = len(flat.parent_idx)
+    if n == 0:
+        return []
+    order = _preorder(flat.left_idx, flat.right_idx, n - 1)
+    if stop_at_leaves:
+        hidden = _pruned(flat)
+        if hidden is not None:
+            order = order[~hidden[order]]
+    return _values(flat, order)
+
+
+def leaf_list_flat(flat: SoATree) -> List:
+    """Returns the leaf values of a flattened tree, left to right."""
+    n = len(flat.parent_idx)
+    if n == 0:
+        return []
+    order = _preorder(flat.left_idx, flat.right_idx, n - 1)
+    # As in leafList, a node whose left subtree is empty is a leaf
+    is_leaf = flat.left_idx[order] == -1
+    hidden = _pruned(flat)
+    if hidden is not None:
+        is_leaf &= ~hidden[order]
+    return _values(flat, order[is_leaf])
+
+
+def descendants_flat(flat: SoATree, node) -> List:
+    """Returns the values of all descendants of node, in preorder.
+
+    Returns [] if node is not in the tree; for repeated values the first
+    match in preorder is used, as with the tuple functions.
+    """
+    # value_str is None for numbers, so only names are compared there
+    found = ~flat.is_numeric & (flat.value_str == node)
+    if isinstance(node, Number):
+        ints = flat.is_numeric & ~flat.is_float
+        found |= (flat.is_float & (flat.value_num == node)) | (ints & (flat.value_int == node))
+    matches = np.flatnonzero(found)
+    if matches.size == 0:
+        return []
+    if matches.size == 1:
+        i = matches[0]
+    else:
+        # Pick the match that a preorder walk reaches first
+        order = _preorder(flat.left_idx, flat.right_idx, len(flat.parent_idx) - 1)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.size, dtype=order.dtype)
+        i = matches[np.argmin(rank[matches])]
+    return _values(flat, _preorder(flat.left_idx, flat.right_idx, i)[1:])
+
+
+def scale_flat(flat: SoATree, scaleFactor) -> SoATree:
+    """Returns a new SoATree with its numeric node values multiplied.
+
+    Names are stored separately, so scaling is a multiply over the numeric
+    arrays (NaN entries for names stay NaN). As with tuple trees, ints
+    stay ints when scaleFactor is an int and become floats otherwise. The
+    other arrays are shared with the input tree, since only the numbers
+    change.
+
+    Raises:
+        OverflowError: If an int result would not fit in 64 bits
+    """
+    if isinstance(scaleFactor, (int, np.integer)):
+        ints = flat.value_int
+        if ints.size and scaleFactor:
+            # int64 multiplication wraps around silently, so check first
+            limit = np.iinfo(np.int64).max // abs(int(scaleFactor))
+            if np.abs(ints).max() > limit:
+                raise OverflowError("Scaled node values do not fit in 64 bits")
+        return flat._replace(value_num=flat.value_num * scaleFactor,
+                             value_int=ints * scaleFactor)
+    # Scaling by a float turns every number into a float
+    numbers = np.where(flat.is_float, flat.value_num, flat.value_int)
+    numbers[~flat.is_numeric] = np.nan
+    return flat._replace(value_num=numbers * scaleFactor,
+                         value_int=np.zeros_like(flat.value_int),
+                         is_float=flat.is_numeric.copy())
+
+
+def _grow(arr, fill):
+    """Returns arr resized to twice its length, new slots set to fill."""
+    old = arr.size
+    arr = np.resize(arr, max(2 * old, 1))
+    arr[old:] = fill
+    return arr
+
+
+_NEWICK_DELIMITERS = "(),:;["
+
+# Plain decimal numbers only: int() and float() would also accept labels
+# such as 'nan', 'inf', 'Infinity' and '1_0', which are names in Newick
+_INT_LABEL = re.compile(r"[+-]?[0-9]+\Z")
+_FLOAT_LABEL = re.compile(r"[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+)(?:[eE][+-]?[0-9]+)?\Z")
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _label_number(label: str):
+    """Returns the int or float a Newick label spells, or None if the label
+    is a name.
+
+    Ints that do not fit in 64 bits and floats that overflow to infinity
+    are kept as names, so every label can be stored.
+    """
+    if _INT_LABEL.match(label):
+        number = int(label)
+        return number if _INT64_MIN <= number <= _INT64_MAX else None
+    if _FLOAT_LABEL.match(label):
+        number = float(label)
+        return number if math.isfinite(number) else None
+    return None
+
+
+def _skip_blanks(text: str, pos: int) -> int:
+    """Skips whitespace and [comments] starting at pos."""
+    while pos < len(text):
+        if text[pos].isspace():
+            pos += 1
+        elif text[pos] == "[":
+            end = text.find("]", pos)
+            if end == -1:
+                raise ValueError("Unterminated [comment] in Newick text")
+            pos = end + 1
+        else:
+            break
+    return pos
+
+
+def _read_label(text: str, pos: int):
+    """Reads an optional node label starting at pos.
+
+    Returns (label, quoted, pos) with pos just past the label.
+    """
+    pos = _skip_blanks(text, pos)
+    if pos < len(text) and text[pos] == "'":
+        # Quoted label; a doubled quote stands for a literal quote
+        chars = []
+        pos += 1
+        while True:
+            end = text.find("'", pos)
+            if end == -1:
+                raise ValueError("Unterminated quoted label in Newick text")
+            chars.append(text[pos:end])
+            if text.startswith("''", end):
+                chars.append("'")
+                pos = end + 2
+            else:
+                return "".join(chars), True, end + 1
+    start = pos
+    while pos < len(text) and text[pos] not in _NEWICK_DELIMITERS and not text[pos].isspace():
+        pos += 1
+    return text[start:pos], False, pos
+
+
+def _skip_branch_length(text: str, pos: int) -> int:
+    """Skips an optional ':length' (and any blanks) after a label."""
+    pos = _skip_blanks(text, pos)
+    if pos < len(text) and text[pos] == ":":
+        pos = _skip_blanks(text, pos + 1)
+        while pos < len(text) and text[pos] not in _NEWICK_DELIMITERS and not text[pos].isspace():
+            pos += 1
+        pos = _skip_blanks(text, pos)
+    return pos
+
+
+def parse_newick_to_soa(text: str) -> SoATree:
+    """Parses a binary tree in Newick format straight into a SoATree.
+
+    The text is scanned once and nodes are written into preallocated
+    arrays (doubled in size when full), without building tuples first.
+    Newick lists every subtree before its parent, so the arrays come out
+    in postorder with the left subtree stored before the right one.
+
+    Numeric labels (e.g. the heights used by DrawTrees2) become numbers:
+    plain decimal ints such as '3' become ints and decimals such as '2.5'
+    or '1e-3' become floats. Other labels, including 'nan' and 'inf', are
+    kept as strings, and missing labels as ''. Branch
+    lengths (':0.5') and [comments] are skipped.
+
+    Args:
+        text: Newick text such as "((A,B)3,C)5;"
+
+    Returns:
+        SoATree: The parsed tree
+
+    Raises:
+        ValueError: If the text is not valid Newick or a node has more
+            than two children
+
+    Examples:
+        >>> flat = parse_newick_to_soa("((A,B)3,C)5;")
+        >>> node_list_flat(flat)
+        [5, 3, 'A', 'B', 'C']
+    """
+    _require_numpy()
+
+    capacity = 16
+    value_num = np.full(capacity, np.nan, dtype=np.float64)
+    value_int = np.zeros(capacity, dtype=np.int64)
+    value_str = np.empty(capacity, dtype=object)
+    is_numeric = np.zeros(capacity, dtype=bool)
+    is_float = np.zeros(capacity, dtype=bool)
+    left_idx = np.full(capacity, -1, dtype=np.int32)
+    right_idx = np.full(capacity, -1, dtype=np.int32)
+    parent_idx = np.full(capacity, -1, dtype=np.int32)
+    n = 0
+
+    groups = []     # child indices collected for each open '('
+    roots = []      # nodes completed outside any parentheses
+
+    def add_node(label, quoted, children):
+        """Stores one node after its children and returns nothing."""
+        nonlocal n, capacity, value_num, value_int, value_str, is_numeric, is_float
+        nonlocal left_idx, right_idx, parent_idx
+        if len(children) > 2:
+            raise ValueError(
+                f"Node '{label}' has {len(children)} children; "
+                "only binary trees are supported"
+            )
+        if n == capacity:
+            value_num = _grow(value_num, np.nan)
+            value_int = _grow(value_int, 0)
+            value_str = _grow(value_str, None)
+            is_numeric = _grow(is_numeric, False)
+            is_float = _grow(is_float, False)
+            left_idx = _grow(left_idx, -1)
+            right_idx = _grow(right_idx, -1)
+            parent_idx = _grow(parent_idx, -1)
+            capacity *= 2
+
+        i = n
+        n += 1
+        number = None if quoted else _label_number(label)
+        if isinstance(number, float):
+            value_num[i] = number
+            is_numeric[i] = True
+            is_float[i] = True
+        elif number is not None:
+            _store_int(value_int, i, number)
+            is_numeric[i] = True
+        else:
+            value_str[i] = label
+        for slot, child in zip((left_idx, right_idx), children):
+            slot[i] = child
+            parent_idx[child] = i
+        (groups[-1] if groups else roots).append(i)
+
+    prev = None     # previous structural character, to spot empty leaves
+    pos = 0
+    while pos < len(text):
+        c = text[pos]
+        if c.isspace() or c == "[":
+            pos = _skip_blanks(text, pos)
+        elif c == ";":
+            break
+        elif c == "(":
+            groups.append([])
+            prev = c
+            pos += 1
+        elif c in ",)":
+            if not groups:
+                raise ValueError(f"Unexpected '{c}' at position {pos} in Newick text")
+            if prev in ("(", ","):
+                # Nothing between the delimiters: an unnamed leaf
+                add_node("", False, [])
+            prev = c
+            pos += 1
+            if c == ")":
+                children = groups.pop()
+                label, quoted, pos = _read_label(text, pos)
+                pos = _skip_branch_length(text, pos)
+                add_node(label, quoted, children)
+        else:
+            label, quoted, pos = _read_label(text, pos)
+            pos = _skip_branch_length(text, pos)
+            add_node(label, quoted, [])
+            prev = None
+
+    if groups:
+        raise ValueError("Unbalanced parentheses in Newick text")
+    if len(roots) != 1:
+        raise ValueError(f"Newick text must contain exactly one tree, found {len(roots)}")
+
+    return SoATree(value_num[:n].copy(), value_int[:n].copy(), value_str[:n].copy(),
+                   is_numeric[:n].copy(), is_float[:n].copy(),
+                   left_idx[:n].copy(), right_idx[:n].copy(), parent_idx[:n].copy())
+
+
+def load_tree(path: str) -> SoATree:
+    """Reads a Newick file into a SoATree.
+
+    Loading is kept separate from the traversal functions on purpose:
+    load a tree once, then run as many queries as needed on the result.
+    When timing traversals, load the tree before starting the clock so
+    the one-time parsing cost is not counted.
+
+    Args:
+        path: Path to a file containing one binary tree in Newick format
+
+    Returns:
+        SoATree: The parsed tree
+    """
+    with open(path) as f:
+        return parse_newick_to_soa(f.read())
@@ -57,86 +57,491 @@ smallTree = ('A',                              # Root node 'A'
 # Hence, passing any tree to the len() function
 # yields a result of 3.
 
+# A leaf may also be written in the shorter form
+# ('D',) instead of ('D', (), ()). The short form
+# takes less memory, and every function in this
+# project accepts both; compact() (at the end of
+# this file) rewrites a whole tree to use it. So a
+# node is a leaf when len(node) == 1 or when its
+# left subtree is ().
+
 
 ####################################################
 # We can perform tasks on a phylogenetic tree
-# recursively. For example, we can:
+# by visiting every node. For example, we can:
 #   (1) Count the number of nodes in a tree,
 #   (2) Measure the height of a tree, and
 #   (3) Create a list of leaves in a tree.
 
+# The chapter writes these functions recursively.
+# Here they keep a list of subtrees still to visit
+# (an explicit stack) instead, which is faster in
+# Python and works for trees of any depth, whereas
+# recursion stops at about 1000 levels.
+
+# The same three functions also accept a tree that
+# has been converted to flat arrays with
+# flat_tree.flatten(), which is much faster for
+# large trees that are analyzed many times.
+
+import sys
+from collections import namedtuple
+from functools import lru_cache, wraps
+
+# Compiled versions of the walks below, built with
+# `python setup.py build_ext --inplace` (needs Cython).
+# Without them the pure-Python walks are used.
+try:
+    import represent_trees_c as _compiled
+except ImportError:
+    _compiled = None
+
+
+# flat_tree (and with it NumPy) is not imported here,
+# so that tuple-only users do not pay for loading it.
+# A flattened tree can only exist once some other
+# code has imported flat_tree, so checking for the
+# loaded module is enough.
+
+def flat_module(Tree):
+    '''returns the flat_tree module if Tree is a
+    flattened tree, else None'''
+    flat_tree = sys.modules.get('flat_tree')
+    if flat_tree is not None and isinstance(Tree, flat_tree.SoATree):
+        return flat_tree
+    return None
+
+
+####################################################
+# Remembering answers for trees seen before.
+# UPGMA and the analysis code ask for the node count,
+# height and leaves of the same trees again and again.
+# Tuple trees never change, so each answer is kept in
+# a cache and returned straight away the next time.
+# Trees are keyed by identity (id) rather than by
+# value, because hashing a tuple tree would itself
+# walk every node.
+# Each memoized function keeps its TREE_CACHE_SIZE
+# most recent answers, and with them the trees they
+# were computed for, until clear_stats_cache().
+# Phylogenetic_Tree_Builder memoizes its node
+# queries the same way.
+
+TREE_CACHE_SIZE = 1024
+_tree_caches = []
+
+
+class _TreeKey:
+    '''wraps a tree so it hashes and compares by identity. Holding the
+reference keeps the tree alive while it is cached, so its id cannot be
+reused by a different tree.'''
+    __slots__ = ('tree',)
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def __hash__(self):
+        return id(self.tree)
+
+    def __eq__(self, other):
+        return self.tree is other.tree
+
+
+def memoized_by_tree(tree_arg=0, copy=None):
+    '''memoizes a function keyed on id() of its tree (the positional
+argument at index tree_arg) and the values of its other arguments.
+copy, if given, is applied to the cached result before returning it, so
+callers that modify a returned list cannot change the cached one. Calls
+with an unhashable argument, or with the tree passed by keyword, are
+answered without caching.'''
+    def decorate(func):
+        @lru_cache(maxsize=TREE_CACHE_SIZE)
+        def cached(*args, **kwargs):
+            args = list(args)
+            args[tree_arg] = args[tree_arg].tree
+            return func(*args, **kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # A TreeInfo already holds its answers, which change when it
+            # is invalidated, so it is passed straight through
+            if len(args) <= tree_arg or isinstance(args[tree_arg], TreeInfo):
+                return func(*args, **kwargs)
+            if len(args) == 1 and not kwargs:
+                # The common case, func(Tree), needs no argument shuffling
+                result = cached(_TreeKey(args[0]))
+            else:
+                before, after = args[:tree_arg], args[tree_arg + 1:]
+                try:
+                    hash((before, after, tuple(kwargs.values())))
+                except TypeError:  # e.g. a list as node: answer without caching
+                    return func(*args, **kwargs)
+                result = cached(*before, _TreeKey(args[tree_arg]), *after, **kwargs)
+            return copy(result) if copy else result
+
+        _tree_caches.append(cached)
+        return wrapper
+    return decorate
+
+
+def clear_stats_cache():
+    '''forgets every answer remembered by memoized_by_tree (releasing the
+trees they hold). Only needed to free memory, or if a flattened tree's
+arrays are modified in place.'''
+    for cache in _tree_caches:
+        cache.cache_clear()
+
 
 ####################################################
-# Counting the nodes in a tree, recursively.
+# Counting the nodes in a tree, iteratively.
 
+@memoized_by_tree()
 def nodeCount(Tree):
     '''Computes the number of nodes in a tree
     
     Args:
-        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree),
+              a SoATree built with flatten(), or a TreeInfo
     
     Returns:
         int: The total number of nodes in the tree
     '''
-    # Extract left and right subtrees
-    Subtree1 = Tree[1]
-    Subtree2 = Tree[2]
-    
-    # Base case: leaf node (both subtrees are empty tuples)
-    if Subtree1 == ():      # base case, subtrees
-        return 1            # of a leaf are empty
-    else:
-        # Recursive case: count current node (1) plus nodes in left and right subtrees
-        return 1 + nodeCount(Subtree1) + nodeCount(Subtree2)
+    # A TreeInfo has measured its tree already
+    if isinstance(Tree, TreeInfo):
+        return Tree.n
+    # Flattened trees store one array slot per node
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.node_count_flat(Tree)
+    # Use the compiled walk when it has been built (it returns None for
+    # unusual nodes, which the Python walk below handles)
+    if _compiled is not None:
+        result = _compiled.node_count(Tree)
+        if result is not None:
+            return result
+
+    count = 0
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        if not t:               # empty subtree
+            continue
+        # Count the current node
+        count += 1
+        # Leaf written as (name,): nothing below it
+        if len(t) == 1:
+            continue
+        # Extract left and right subtrees
+        _, left, right = t
+        # Leaf node (1st subtree is an empty tuple): nothing below it
+        if left:
+            # Internal node: visit the left and right subtrees too
+            stack.append(left)
+            stack.append(right)
+    return count
 
 
 ####################################################
-# Measuring the height of a tree, recursively.
+# Measuring the height of a tree, iteratively.
 # Height is defined as the number of edges from root to deepest leaf.
 # A tree with only a root has height 0.
 
+@memoized_by_tree()
 def height(Tree):
     '''Computes height of a tree
     
     Args:
-        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree),
+              a SoATree built with flatten(), or a TreeInfo
     
     Returns:
         int: The height of the tree (0 for a leaf, increases by 1 for each level)
     '''
-    # Extract left and right subtrees
-    Subtree1 = Tree[1]
-    Subtree2 = Tree[2]
+    # A TreeInfo has measured its tree already
+    if isinstance(Tree, TreeInfo):
+        return Tree.h
+    # Flattened trees are measured with a loop over the arrays
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.height_flat(Tree)
+    # Use the compiled walk when it has been built
+    if _compiled is not None:
+        result = _compiled.height(Tree)
+        if result is not None:
+            return result
+
+    # The height is the depth of the deepest leaf, so track the depth of
+    # every subtree on the stack
+    max_depth = 0
+    stack = [(Tree, 0)]
+    while stack:
+        t, depth = stack.pop()
+        if not t:               # empty subtree
+            continue
+        # Extract left and right subtrees (a leaf may be written as (name,))
+        left = right = ()
+        if len(t) != 1:
+            _, left, right = t
+        # Leaf node (1st subtree is an empty tuple): a candidate for deepest
+        if not left:
+            if depth > max_depth:
+                max_depth = depth
+        else:
+            # Internal node: its subtrees are one level deeper
+            stack.append((left, depth + 1))
+            stack.append((right, depth + 1))
+    return max_depth
+
+
+####################################################
+# Depth of every node at once.
+# Calling height() on every subtree to find how deep
+# each node sits would walk the tree again for every
+# node, which is quadratic on long chains. all_depths
+# finds every depth in a single walk from the root,
+# each node one level below its parent. Use it
+# whenever depths of many nodes are needed, e.g. for
+# drawing.
+
+def all_depths(Tree):
+    '''Computes the depth (edges below the root) of every node
     
-    # Base case: leaf node (subtrees are empty), height is 0
-    if Subtree1 == ():      # base case, 1st subtree
-        return 0            # is an empty tuple.
-    else:
-        # Recursive case: height is 1 (for current level) plus maximum height of subtrees
-        return 1 + max(height(Subtree1), height(Subtree2))
+    Args:
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+    
+    Returns:
+        dict: Maps id(subtree) to its depth, for every non-empty subtree.
+            A subtree object that is shared by several parents keeps the
+            depth of its first occurrence, left before right.
+    '''
+    depths = {}
+    stack = [(Tree, 0)]
+    while stack:
+        t, depth = stack.pop()
+        if not t or id(t) in depths:     # empty or already seen
+            continue
+        depths[id(t)] = depth
+        if len(t) == 3:
+            # Push right first so the left subtree is visited first
+            stack.append((t[2], depth + 1))
+            stack.append((t[1], depth + 1))
+    return depths
 
 
 ####################################################
-# Listing the leaves in a tree, recursively.
+# Listing the leaves in a tree, iteratively.
 
+@memoized_by_tree(copy=list)
 def leafList(Tree):
     '''Returns the list of leaves in a tree
     
     Args:
-        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree),
+              a SoATree built with flatten(), or a TreeInfo
     
     Returns:
         list: A list containing the names of all leaf nodes in the tree
+
+    To loop over the leaves without building a list, use iter_leaves();
+    to count them, use tree_stats() or leafCount().
+    '''
+    # A TreeInfo has measured its tree already
+    if isinstance(Tree, TreeInfo):
+        return list(Tree.leaves)
+    # Flattened trees select leaves with a mask over the child arrays
+    flat = flat_module(Tree)
+    if flat is not None:
+        return flat.leaf_list_flat(Tree)
+    # Use the compiled walk when it has been built
+    if _compiled is not None:
+        result = _compiled.leaf_list(Tree)
+        if result is not None:
+            return result
+
+    # Walk the tree with an explicit stack, appending each leaf to one
+    # output list. (Joining the lists of the two subtrees at every level
+    # would copy the leaves over and over on large trees.)
+    leaves = []
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        if not t:               # empty subtree
+            continue
+        # Leaf written as (name,): record its name
+        if len(t) == 1:
+            leaves.append(t[0])
+            continue
+        # Extract root node and left/right subtrees
+        root, left, right = t
+        # Leaf node (1st subtree is an empty tuple): record its name
+        if not left:
+            leaves.append(root)
+        else:
+            # Push right first so leaves come out left to right
+            stack.append(right)
+            stack.append(left)
+    return leaves
+
+
+def iter_leaves(Tree):
+    '''Yields the leaves of a tree one at a time, left to right
+    
+    Args:
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree),
+              a SoATree built with flatten(), or a TreeInfo
+    
+    Yields:
+        The name of each leaf node, in the same order as leafList()
+
+    Use this instead of leafList() when the leaves are only looped over,
+    e.g. to stop at the first match, so no list of all leaves is built.
     '''
-    # Extract root node and left/right subtrees
-    Root = Tree[0]
-    Subtree1 = Tree[1]
-    Subtree2 = Tree[2]
+    # These already hold (or build in one step) the full leaf list
+    if isinstance(Tree, TreeInfo):
+        yield from Tree.leaves
+        return
+    flat = flat_module(Tree)
+    if flat is not None:
+        yield from flat.leaf_list_flat(Tree)
+        return
+
+    # Same walk as leafList, handing out each leaf as it is reached
+    stack = [Tree]
+    while stack:
+        t = stack.pop()
+        if not t:               # empty subtree
+            continue
+        # Leaf written as (name,)
+        if len(t) == 1:
+            yield t[0]
+            continue
+        root, left, right = t
+        if not left:
+            yield root
+        else:
+            # Push right first so leaves come out left to right
+            stack.append(right)
+            stack.append(left)
+
+
+####################################################
+# Computing several measurements in one pass.
+# Drawing and reporting code usually needs the leaf
+# count, height, node list and leaf list together.
+# Calling the separate functions walks the tree four
+# times; tree_stats walks it once.
+
+TreeStats = namedtuple('TreeStats', ['leaf_count', 'height', 'nodes', 'leaves'])
+
+
+def _copy_stats(stats):
+    '''returns stats with fresh copies of its node and leaf lists'''
+    return stats._replace(nodes=list(stats.nodes), leaves=list(stats.leaves))
+
+
+@memoized_by_tree(copy=_copy_stats)
+def tree_stats(Tree):
+    '''Computes leaf count, height, node list and leaf list in one pass
+    
+    Args:
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree),
+              a SoATree built with flatten(), or a TreeInfo
     
-    # Base case: leaf node (subtrees are empty), return root as a list
-    if Subtree1 == ():      # base case, 1st subtree
-        return [Root]       # is an empty tuple.
-    else:
-        # Recursive case: combine leaves from left and right subtrees
-        return leafList(Subtree1) + leafList(Subtree2)
+    Returns:
+        TreeStats: A named tuple (leaf_count, height, nodes, leaves) where
+            nodes lists every node in preorder and leaves lists the leaf
+            names from left to right
+    '''
+    # A TreeInfo keeps only the counts and leaves, so measure its tree
+    if isinstance(Tree, TreeInfo):
+        Tree = Tree.tree
+    # Flattened trees reuse the array versions of each measurement
+    flat = flat_module(Tree)
+    if flat is not None:
+        leaves = flat.leaf_list_flat(Tree)
+        return TreeStats(len(leaves), flat.height_flat(Tree),
+                         flat.node_list_flat(Tree, stop_at_leaves=True), leaves)
+
+    nodes = []
+    leaves = []
+    max_depth = 0
+    # Each stack entry pairs a subtree with its depth below the root
+    stack = [(Tree, 0)]
+    while stack:
+        t, depth = stack.pop()
+        if not t:                           # empty subtree
+            continue
+        nodes.append(t[0])
+        if depth > max_depth:
+            max_depth = depth
+        # Same leaf test as nodeCount/height/leafList: written as (name,),
+        # or its left subtree is empty
+        if len(t) == 1 or not t[1]:
+            leaves.append(t[0])             # leaf node
+        else:
+            # Push right first so the left subtree is visited first
+            stack.append((t[2], depth + 1))
+            stack.append((t[1], depth + 1))
+    return TreeStats(len(leaves), max_depth, nodes, leaves)
+
+
+####################################################
+# Keeping the measurements with the tree.
+# A TreeInfo measures its tree once, when it is
+# created, and keeps the node count, height and
+# leaves as attributes. nodeCount, height and
+# leafList return those straight away, without
+# walking the tree or looking it up in a cache.
+
+class TreeInfo:
+    '''wraps a tree together with its node count (n), height (h) and
+leaf names (leaves), all measured in one pass'''
+    __slots__ = ('tree', 'n', 'h', 'leaves')
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.invalidate()
+
+    def invalidate(self):
+        '''measures the tree again, e.g. after a flattened tree's arrays
+were modified in place'''
+        # Call the uncached tree_stats so the tree is really walked again
+        stats = tree_stats.__wrapped__(self.tree)
+        self.n = len(stats.nodes)
+        self.h = stats.height
+        self.leaves = tuple(stats.leaves)
 
+
+####################################################
+# Writing leaves in the short form.
+# compact() rebuilds a tree with every leaf written
+# as (name,). Children are rebuilt before their
+# parent, using an explicit stack as above.
+
+def compact(Tree):
+    '''Rewrites every leaf (name, (), ()) of a tree as (name,)
+    
+    Args:
+        Tree: A tuple representing a tree (node_name, left_subtree, right_subtree)
+    
+    Returns:
+        tuple: The same tree with short-form leaves
+    '''
+    # `built` holds the rebuilt children until their parent is reached
+    built = []
+    stack = [(Tree, False)]
+    while stack:
+        t, expanded = stack.pop()
+        if not t or len(t) != 3:            # empty subtree or (name,) leaf
+            built.append(t)
+        elif not t[1] and not t[2]:         # (name, (), ()) leaf
+            built.append((t[0],))
+        elif expanded:
+            right = built.pop()
+            left = built.pop()
+            built.append((t[0], left, right))
+        else:
+            stack.append((t, True))
+            stack.append((t[2], False))
+            stack.append((t[1], False))
+    return built.pop()
@@ -0,0 +1,118 @@
+# cython: language_level=3
+"""Compiled versions of the tree walks in represent_trees.py.
+
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+represent_trees.py uses these when the extension has been built and
+falls back to its pure-Python walks otherwise. The compiled walks handle
+trees made of (value, left, right) and (name,) tuples; when they meet any
+other node they return None, and the Python walk runs instead (and raises
+its usual error).
+
+Functions:
+    node_count: Number of nodes in a tuple tree
+    height: Number of edges from the root to the deepest leaf
+    leaf_list: Leaf names from left to right
+"""
+
+from cpython.tuple cimport PyTuple_GET_ITEM, PyTuple_GET_SIZE
+
+
+cdef inline Py_ssize_t _size(object t):
+    """Number of items in a tuple node, or -1 for anything else."""
+    return PyTuple_GET_SIZE(t) if type(t) is tuple else -1
+
+
+cdef object _node_count(object tree):
+    cdef list stack = [tree]
+    cdef long count = 0
+    cdef Py_ssize_t size
+    cdef object t, left, right
+    while stack:
+        t = stack.pop()
+        if not t:               # empty subtree
+            continue
+        count += 1
+        size = _size(t)
+        if size == 1:           # leaf written as (name,)
+            continue
+        if size != 3:
+            return None
+        left = <object>PyTuple_GET_ITEM(t, 1)
+        right = <object>PyTuple_GET_ITEM(t, 2)
+        if left:
+            stack.append(left)
+            stack.append(right)
+    return count
+
+
+cdef object _height(object tree):
+    # Subtrees and their depths are kept on two parallel stacks
+    cdef list stack = [tree]
+    cdef list depths = [0]
+    cdef long depth, max_depth = 0
+    cdef Py_ssize_t size
+    cdef object t
+    while stack:
+        t = stack.pop()
+        depth = depths.pop()
+        if not t:               # empty subtree
+            continue
+        size = _size(t)
+        if size != 1 and size != 3:
+            return None
+        if size == 1 or not <object>PyTuple_GET_ITEM(t, 1):
+            if depth > max_depth:
+                max_depth = depth
+        else:
+            stack.append(<object>PyTuple_GET_ITEM(t, 1))
+            stack.append(<object>PyTuple_GET_ITEM(t, 2))
+            depths.append(depth + 1)
+            depths.append(depth + 1)
+    return max_depth
+
+
+cdef object _leaf_list(object tree):
+    cdef list leaves = []
+    cdef list stack = [tree]
+    cdef Py_ssize_t size
+    cdef object t, left, right
+    while stack:
+        t = stack.pop()
+        if not t:               # empty subtree
+            continue
+        size = _size(t)
+        if size == 1:           # leaf written as (name,)
+            leaves.append(<object>PyTuple_GET_ITEM(t, 0))
+            continue
+        if size != 3:
+            return None
+        left = <object>PyTuple_GET_ITEM(t, 1)
+        right = <object>PyTuple_GET_ITEM(t, 2)
+        if not left:
+            leaves.append(<object>PyTuple_GET_ITEM(t, 0))
+        else:
+            # Push right first so leaves come out left to right
+            stack.append(right)
+            stack.append(left)
+    return leaves
+
+
+def node_count(tree):
+    """Computes the number of nodes in a tuple tree, or None if it has
+    nodes of another shape."""
+    return _node_count(tree)
+
+
+def height(tree):
+    """Computes the height of a tuple tree (0 for a single leaf), or None
+    if it has nodes of another shape."""
+    return _height(tree)
+
+
+def leaf_list(tree):
+    """Returns the names of the leaves of a tuple tree, left to right, or
+    None if it has nodes of another shape."""
+    return _leaf_list(tree)
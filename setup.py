@@ -0,0 +1,16 @@
+"""Builds the optional compiled tree walks in represent_trees_c.pyx.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+Everything works without this step; the compiled walks only make
+nodeCount, height and leafList faster on large trees.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="phylogenetic-tree-builder-ext",
+    ext_modules=cythonize("represent_trees_c.pyx"),
+)
@@ -0,0 +1,55 @@
+"""Tests for the Cairo backend in draw_phylo_tree.py.
+
+Run with:
+
+    python -m unittest test_draw_phylo_tree
+
+The rendering tests are skipped when pycairo is not installed.
+"""
+
+import unittest
+
+import draw_phylo_tree
+from draw_phylo_tree import drawPhyloTree, render_cairo
+from represent_trees import smallTree
+
+
+class SurfaceTests(unittest.TestCase):
+
+    def test_cairo_backend_needs_surface(self):
+        with self.assertRaisesRegex(ValueError, "cairo.Surface"):
+            drawPhyloTree(smallTree, backend="cairo")
+
+    def test_render_cairo_needs_surface(self):
+        with self.assertRaises(ValueError):
+            render_cairo(smallTree, None)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            drawPhyloTree(smallTree, backend="svg")
+
+
+@unittest.skipIf(draw_phylo_tree.cairo is None, "pycairo is not installed")
+class RenderCairoTests(unittest.TestCase):
+
+    def render(self, tree, **kwargs):
+        cairo = draw_phylo_tree.cairo
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 400, 300)
+        drawPhyloTree(tree, backend="cairo", surface=surface, **kwargs)
+        surface.flush()
+        return surface
+
+    def drawn_pixels(self, surface):
+        # Alpha is the 4th byte of each pixel; untouched pixels stay 0
+        return sum(1 for alpha in bytes(surface.get_data())[3::4] if alpha)
+
+    def test_draws_something(self):
+        surface = self.render(smallTree, branch_length=80, angle=45)
+        self.assertGreater(self.drawn_pixels(surface), 0)
+
+    def test_empty_tree_draws_nothing(self):
+        self.assertEqual(self.drawn_pixels(self.render(())), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Tests for the Newick parser and the flatten/unflatten round trip in flat_tree.py.
+
+Run with:
+
+    python -m unittest test_flat_tree
+"""
+
+import unittest
+
+try:
+    import numpy  # noqa: F401
+except ImportError:  # pragma: no cover - exercised only without numpy
+    numpy = None
+
+if numpy is not None:
+    from flat_tree import (flatten, unflatten, parse_newick_to_soa,
+                           node_list_flat, leaf_list_flat, descendants_flat)
+
+
+SAMPLE = (5, (3, ('A', (), ()), ('B', (), ())), ('C', (), ()))
+
+
+@unittest.skipIf(numpy is None, "flat_tree requires NumPy")
+class RoundTripTests(unittest.TestCase):
+
+    def test_flatten_unflatten(self):
+        self.assertEqual(unflatten(flatten(SAMPLE)), SAMPLE)
+
+    def test_single_leaf(self):
+        self.assertEqual(unflatten(flatten(('A', (), ()))), ('A', (), ()))
+
+    def test_short_leaves(self):
+        self.assertEqual(unflatten(flatten((1, ('A',), ('B',)))),
+                         (1, ('A', (), ()), ('B', (), ())))
+
+    def test_ints_and_floats_kept_apart(self):
+        tree = (2, (2.0, ('x', (), ()), (-7, (), ())), (2 ** 62, (), ()))
+        back = unflatten(flatten(tree))
+        self.assertEqual(back, tree)
+        self.assertEqual([type(v) for v in node_list_flat(flatten(back))],
+                         [int, float, str, int, int])
+
+    def test_int_too_large(self):
+        with self.assertRaises(OverflowError):
+            flatten((2 ** 64, (), ()))
+
+    def test_parse_then_unflatten(self):
+        self.assertEqual(unflatten(parse_newick_to_soa("((A,B)3,C)5;")), SAMPLE)
+
+    def test_parse_unflatten_flatten(self):
+        flat = parse_newick_to_soa("((A:0.1,B:0.2)3[note],'C d')2.5;")
+        again = flatten(unflatten(flat))
+        self.assertEqual(node_list_flat(again), node_list_flat(flat))
+        self.assertEqual(leaf_list_flat(again), ['A', 'B', 'C d'])
+
+
+@unittest.skipIf(numpy is None, "flat_tree requires NumPy")
+class DescendantsTests(unittest.TestCase):
+
+    def test_numeric_root(self):
+        flat = flatten(SAMPLE)
+        self.assertEqual(descendants_flat(flat, 5), [3, 'A', 'B', 'C'])
+        self.assertEqual(descendants_flat(flat, 5.0), [3, 'A', 'B', 'C'])
+        self.assertEqual(descendants_flat(flat, numpy.int64(3)), ['A', 'B'])
+
+    def test_none_matches_no_number(self):
+        self.assertEqual(descendants_flat(flatten(SAMPLE), None), [])
+
+    def test_names(self):
+        flat = flatten(SAMPLE)
+        self.assertEqual(descendants_flat(flat, 'A'), [])
+        self.assertEqual(descendants_flat(flat, '5'), [])
+
+    def test_bools_come_back_as_ints(self):
+        self.assertEqual(unflatten(flatten((True, ('A', (), ()), ()))),
+                         (1, ('A', (), ()), ()))
+
+
+@unittest.skipIf(numpy is None, "flat_tree requires NumPy")
+class ParseLabelTests(unittest.TestCase):
+
+    def labels(self, text):
+        return node_list_flat(parse_newick_to_soa(text))
+
+    def test_numbers(self):
+        self.assertEqual(self.labels("((1,-2)2.5,(.5,1e3)+4)0;"),
+                         [0, 2.5, 1, -2, 4, 0.5, 1000.0])
+        self.assertEqual([type(v) for v in self.labels("(3,3.)x;")],
+                         [str, int, float])
+
+    def test_special_floats_stay_names(self):
+        self.assertEqual(self.labels("((nan,inf)Infinity,(-inf,NaN)1e999)x;"),
+                         ['x', 'Infinity', 'nan', 'inf', '1e999', '-inf', 'NaN'])
+
+    def test_underscores_and_hex_stay_names(self):
+        self.assertEqual(self.labels("(1_0,0x10)1_000;"), ['1_000', '1_0', '0x10'])
+
+    def test_large_int_stays_name(self):
+        self.assertEqual(self.labels("(A,B)99999999999999999999;"),
+                         ['99999999999999999999', 'A', 'B'])
+
+    def test_quoted_number_stays_name(self):
+        self.assertEqual(self.labels("('1','it''s')2;"), [2, '1', "it's"])
+
+    def test_empty_labels(self):
+        self.assertEqual(self.labels("(,);"), ['', '', ''])
+
+
+@unittest.skipIf(numpy is None, "flat_tree requires NumPy")
+class ParseErrorTests(unittest.TestCase):
+
+    def assertParseError(self, text, message):
+        with self.assertRaisesRegex(ValueError, message):
+            parse_newick_to_soa(text)
+
+    def test_unbalanced_open(self):
+        self.assertParseError("((A,B),C;", "Unbalanced parentheses")
+
+    def test_unexpected_close(self):
+        self.assertParseError("(A,B));", r"Unexpected '\)'")
+
+    def test_unexpected_comma(self):
+        self.assertParseError("A,B;", "Unexpected ','")
+
+    def test_more_than_two_children(self):
+        self.assertParseError("(A,B,C)x;", "only binary trees")
+
+    def test_multiple_trees(self):
+        self.assertParseError("(A,B)(C,D);", "exactly one tree")
+
+    def test_no_tree(self):
+        self.assertParseError(";", "exactly one tree")
+
+    def test_unterminated_comment(self):
+        self.assertParseError("(A,B)[x;", "Unterminated")
+
+    def test_unterminated_quote(self):
+        self.assertParseError("('A,B);", "Unterminated quoted label")
+
+
+if __name__ == "__main__":
+    unittest.main()
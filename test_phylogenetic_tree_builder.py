@@ -0,0 +1,81 @@
+"""Tests for scale() in Phylogenetic_Tree_Builder.py.
+
+Run with:
+
+    python -m unittest test_phylogenetic_tree_builder
+"""
+
+import unittest
+
+from Phylogenetic_Tree_Builder import scale
+
+
+def scaled(tree, factor):
+    """Straightforward recursive scale, to compare against."""
+    if not tree:
+        return tree
+    value = tree[0] * factor if isinstance(tree[0], (int, float)) else tree[0]
+    if len(tree) == 1:
+        return (value,)
+    return (value, scaled(tree[1], factor), scaled(tree[2], factor))
+
+
+def number_free(tree):
+    """True if no node of tree holds a number."""
+    stack = [tree]
+    while stack:
+        t = stack.pop()
+        if not t:
+            continue
+        if isinstance(t[0], (int, float)):
+            return False
+        stack.extend(t[1:])
+    return True
+
+
+class ScaleMemoTests(unittest.TestCase):
+
+    LEFT = ('X', ('A', (), ()), ('B',))
+    TREE = (4, LEFT, (2.5, ('C', (), ()), (1, ('D', (), ()), ('E', (), ()))))
+
+    def assertShared(self, original, result):
+        """Number-free subtrees of the result are the original objects."""
+        if not original or number_free(original):
+            self.assertIs(result, original)
+            return
+        for child, new_child in zip(original[1:], result[1:]):
+            self.assertShared(child, new_child)
+
+    def test_repeated_factors(self):
+        for factor in (2, 3, 0.5, -1, 2, 0):
+            with self.subTest(factor=factor):
+                result = scale(self.TREE, factor)
+                self.assertEqual(result, scaled(self.TREE, factor))
+                self.assertShared(self.TREE, result)
+                self.assertIs(result[1], self.LEFT)
+
+    def test_switching_trees(self):
+        other = (1, ('A', (), ()), ())
+        for factor in (2, 3):
+            self.assertEqual(scale(self.TREE, factor), scaled(self.TREE, factor))
+            self.assertEqual(scale(other, factor), scaled(other, factor))
+            self.assertIs(scale(other, factor)[1], other[1])
+
+    def test_number_free_root(self):
+        tree = ('R', ('A', (), ()), ('S', ('B',), ('C', (), ())))
+        for factor in (2, 3.5, 2):
+            with self.subTest(factor=factor):
+                self.assertIs(scale(tree, factor), tree)
+
+    def test_number_free_root_with_numeric_leaf(self):
+        tree = ('R', ('A', (), ()), ('S', (7,), ('C', (), ())))
+        for factor in (2, 3):
+            with self.subTest(factor=factor):
+                result = scale(tree, factor)
+                self.assertEqual(result, scaled(tree, factor))
+                self.assertIs(result[1], tree[1])
+                self.assertIs(result[2][2], tree[2][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
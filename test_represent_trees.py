@@ -0,0 +1,131 @@
+"""Tests for the tree measurements in represent_trees.py.
+
+Run with:
+
+    python -m unittest test_represent_trees
+"""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised only without numpy
+    numpy = None
+
+import represent_trees
+from represent_trees import nodeCount, height, leafList, iter_leaves, tree_stats
+
+
+# An empty right subtree below an internal node
+ONE_CHILD = ('v', ('a', (), ()), ())
+
+
+class EmptySubtreeTests(unittest.TestCase):
+
+    def test_leaf_list(self):
+        self.assertEqual(leafList(ONE_CHILD), ['a'])
+
+    def test_leaf_list_python_walk(self):
+        compiled, represent_trees._compiled = represent_trees._compiled, None
+        try:
+            self.assertEqual(leafList(ONE_CHILD), ['a'])
+        finally:
+            represent_trees._compiled = compiled
+
+    @unittest.skipIf(represent_trees._compiled is None, "compiled walks not built")
+    def test_compiled_leaf_list(self):
+        self.assertEqual(represent_trees._compiled.leaf_list(ONE_CHILD), ['a'])
+
+    def test_iter_leaves(self):
+        self.assertEqual(list(iter_leaves(ONE_CHILD)), ['a'])
+
+    def test_measurements_agree(self):
+        stats = tree_stats(ONE_CHILD)
+        self.assertEqual(nodeCount(ONE_CHILD), len(stats.nodes))
+        self.assertEqual(height(ONE_CHILD), stats.height)
+        self.assertEqual(leafList(ONE_CHILD), stats.leaves)
+
+
+class MemoizedByTreeTests(unittest.TestCase):
+
+    def test_results_are_copies(self):
+        tree = ('r', ('a', (), ()), ('b', (), ()))
+        leafList(tree).append('junk')
+        self.assertEqual(leafList(tree), ['a', 'b'])
+
+    def test_node_queries_share_the_cache(self):
+        from Phylogenetic_Tree_Builder import parent, find
+        tree = ('r', ('a', (), ()), ('b', (), ()))
+        self.assertEqual(parent('r', tree, parent_node='x'), 'x')
+        self.assertEqual(parent('a', tree), 'r')
+        self.assertFalse(find(['a'], tree))   # unhashable node: not cached
+        self.assertTrue(any(cache.cache_info().currsize
+                            for cache in represent_trees._tree_caches))
+        represent_trees.clear_stats_cache()
+        for cache in represent_trees._tree_caches:
+            self.assertEqual(cache.cache_info().currsize, 0)
+
+
+def random_tree(rng, depth):
+    """A random tree mixing (name, (), ()) and (name,) leaves, ints, floats
+    and names, and nodes with only one non-empty subtree."""
+    if depth == 0 or rng.random() < 0.25:
+        return (f"L{rng.randrange(100)}",) if rng.random() < 0.3 else (f"L{rng.randrange(100)}", (), ())
+    value = rng.choice([rng.randrange(10), rng.random(), f"N{rng.randrange(100)}"])
+    left = () if rng.random() < 0.15 else random_tree(rng, depth - 1)
+    right = () if rng.random() < 0.15 else random_tree(rng, depth - 1)
+    return (value, left, right)
+
+
+@unittest.skipIf(numpy is None, "flat_tree requires NumPy")
+class FlatTreeAgreementTests(unittest.TestCase):
+    """The flat versions skip the same nodes as the tuple walks: a node
+    whose left subtree is empty counts as a leaf, and its right subtree
+    is not looked at."""
+
+    TREES = [
+        ('A', (), ()),
+        ('A',),
+        ('v', ('a', (), ()), ()),
+        ('v', (), ('b', (), ())),
+        ('v', (), ('b', ('c', (), ()), ('d', (), ()))),
+        (1, ('A',), ('B',)),
+        (1, (2, (), ('x', ('y',), ('z',))), ('B',)),
+        (1, (2.5, ('A',), ()), (3, (), ('C', (), ()))),
+    ]
+
+    def assertAgree(self, tree):
+        from flat_tree import flatten
+        flat = flatten(tree)
+        with self.subTest(tree=tree):
+            self.assertEqual(nodeCount(flat), nodeCount(tree))
+            self.assertEqual(height(flat), height(tree))
+            self.assertEqual(leafList(flat), leafList(tree))
+            self.assertEqual(list(iter_leaves(flat)), list(iter_leaves(tree)))
+            self.assertEqual(tree_stats(flat), tree_stats(tree))
+
+    def test_hand_written_trees(self):
+        for tree in self.TREES:
+            self.assertAgree(tree)
+
+    def test_right_subtree_below_empty_left_is_skipped(self):
+        tree = ('v', (), ('b', (), ()))
+        self.assertEqual(nodeCount(tree), 1)
+        self.assertEqual(leafList(tree), ['v'])
+        self.assertEqual(tree_stats(tree).nodes, ['v'])
+
+    def test_node_list_stop_at_leaves(self):
+        from flat_tree import flatten, node_list_flat
+        flat = flatten((1, (2, (), ('x', (), ())), ('B',)))
+        self.assertEqual(node_list_flat(flat), [1, 2, 'x', 'B'])
+        self.assertEqual(node_list_flat(flat, stop_at_leaves=True), [1, 2, 'B'])
+
+    def test_random_trees(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            self.assertAgree(random_tree(rng, rng.randrange(8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
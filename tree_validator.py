@@ -11,9 +11,25 @@ Functions:
 
 from typing import Union, Tuple, Dict, Any, Optional
 
+# Tree analysis functions for get_tree_structure_info; validation itself
+# works without them
+try:
+    from represent_trees import tree_stats as _tree_stats
+except ImportError:
+    _tree_stats = None
+
 # Type alias for trees
 Tree = Union[Tuple, None]
 
+# Error messages. The format methods are bound once here; they are only
+# called for the node that has a problem.
+_NONE_ERROR = "{} cannot be None".format
+_TYPE_ERROR = "{} must be a tuple, got {}".format
+_EMPTY_ERROR = "{} cannot be empty".format
+_SIZE_ERROR = "{} must have 1 (leaf) or 3 (internal) elements, got {}. Tree structure: {}".format
+_SIZE_ISSUE = "Tree must have 1 (leaf) or 3 (internal) elements, got {}".format
+_TYPE_ISSUE = "Tree must be a tuple, got {}".format
+
 
 def validate_tree(tree: Tree, name: str = "Tree") -> bool:
     """Validates that a tree has the correct structure.
@@ -22,11 +38,11 @@ def validate_tree(tree: Tree, name: str = "Tree") -> bool:
     - Tree is a tuple (not None, not a list, etc.)
     - Tree is not empty
     - Tree has either 1 element (leaf) or 3 elements (internal node)
-    - Subtrees are recursively valid
+    - Subtrees are valid too (an empty subtree () below a node is allowed)
     
     Args:
         tree: Tree structure to validate
-        name: Name for error messages (used recursively for nested errors)
+        name: Name for error messages (subtrees are reported as name.left, etc.)
         
     Returns:
         True if tree is valid
@@ -49,42 +65,75 @@ def validate_tree(tree: Tree, name: str = "Tree") -> bool:
             ...
         ValueError: Tree must have 1 (leaf) or 3 (internal) elements, got 4
     """
-    # Check if tree is None or empty
-    if tree is None:
-        raise ValueError(f"{name} cannot be None")
-    
-    # Check if tree is a tuple
-    if not isinstance(tree, tuple):
-        raise TypeError(
-            f"{name} must be a tuple, got {type(tree).__name__}"
-        )
-    
-    # Check if tree is empty
-    if len(tree) == 0:
-        raise ValueError(f"{name} cannot be empty")
-    
-    # Leaf node: single element
-    if len(tree) == 1:
-        return True
-    
-    # Internal node: must have exactly 3 elements (value, left, right)
-    if len(tree) != 3:
-        raise ValueError(
-            f"{name} must have 1 (leaf) or 3 (internal) elements, "
-            f"got {len(tree)}. Tree structure: {tree}"
-        )
-    
-    # Recursively validate left subtree
-    if tree[1] is not None:
-        validate_tree(tree[1], f"{name}.left")
-    
-    # Recursively validate right subtree
-    if tree[2] is not None:
-        validate_tree(tree[2], f"{name}.right")
-    
+    problem = _check(tree, name)
+    if problem is not None:
+        error_type, message = problem
+        raise error_type(message)
     return True
 
 
+def _check(tree: Tree, name: str = "Tree") -> Optional[Tuple[type, str]]:
+    """Finds the first problem in a tree without raising.
+
+    Returns:
+        None if the tree is valid, otherwise (error_type, message) where
+        error_type is TypeError or ValueError, as raised by validate_tree
+    """
+    # Walk the tree with an explicit stack so deep trees cannot exceed
+    # Python's recursion limit. Each entry carries the path to its subtree
+    # as a linked (parent_path, step) pair; the dotted name such as
+    # "Tree.left.right" is only spelled out when a problem is found.
+    # The inner loop moves straight on to a node's left child instead of
+    # pushing it and popping it again; only right children wait on the
+    # stack.
+    stack = [(tree, None)]
+    while stack:
+        t, path = stack.pop()
+        while True:
+            # Check if tree is None
+            if t is None:
+                return ValueError, _NONE_ERROR(_path_name(name, path))
+
+            # Check if tree is a tuple
+            if not isinstance(t, tuple):
+                return TypeError, _TYPE_ERROR(_path_name(name, path), type(t).__name__)
+
+            # Check if tree is empty (an empty subtree below a node is fine)
+            if not t:
+                if path is not None:
+                    break
+                return ValueError, _EMPTY_ERROR(name)
+
+            # Leaf node: single element
+            if len(t) == 1:
+                break
+
+            # Internal node: must have exactly 3 elements (value, left, right)
+            if len(t) != 3:
+                return ValueError, _SIZE_ERROR(_path_name(name, path), len(t), t)
+
+            _, left, right = t
+
+            # Right subtree waits; the left subtree is checked next
+            if right is not None:
+                stack.append((right, (path, "right")))
+            if left is None:
+                break
+            t, path = left, (path, "left")
+
+    return None
+
+
+def _path_name(name: str, path: Optional[tuple]) -> str:
+    """Spells out a (parent_path, step) chain as a dotted name like "Tree.left.right"."""
+    steps = []
+    while path is not None:
+        path, step = path
+        steps.append(step)
+    steps.append(name)
+    return ".".join(reversed(steps))
+
+
 def is_valid_tree(tree: Tree) -> bool:
     """Check if tree is valid without raising exceptions.
     
@@ -107,11 +156,7 @@ def is_valid_tree(tree: Tree) -> bool:
         >>> is_valid_tree(('A', 'B', 'C', 'D'))
         False
     """
-    try:
-        validate_tree(tree)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return _check(tree) is None
 
 
 def get_tree_structure_info(tree: Tree) -> Dict[str, Any]:
@@ -143,34 +188,32 @@ def get_tree_structure_info(tree: Tree) -> Dict[str, Any]:
         >>> info['leaves']
         2
     """
-    # First check if tree is valid
-    if not is_valid_tree(tree):
-        try:
-            validate_tree(tree)  # This will raise the actual error
-        except (ValueError, TypeError) as e:
-            return {
-                "valid": False,
-                "error": str(e),
-                "error_type": type(e).__name__
-            }
+    # Check if tree is valid (one walk finds both the verdict and the error)
+    problem = _check(tree)
+    if problem is not None:
+        error_type, message = problem
+        return {
+            "valid": False,
+            "error": message,
+            "error_type": error_type.__name__
+        }
     
-    # Import tree analysis functions
-    try:
-        from represent_trees import nodeCount, height, leafList
-    except ImportError:
+    # Tree analysis functions are optional
+    if _tree_stats is None:
         return {
             "valid": True,
             "error": "Could not import analysis functions from represent_trees"
         }
     
-    # Calculate tree metrics
+    # Calculate all tree metrics in a single traversal
     try:
+        stats = _tree_stats(tree)
         return {
             "valid": True,
-            "nodes": nodeCount(tree),
-            "height": height(tree),
-            "leaves": len(leafList(tree)),
-            "leaf_names": leafList(tree),
+            "nodes": len(stats.nodes),
+            "height": stats.height,
+            "leaves": stats.leaf_count,
+            "leaf_names": stats.leaves,
             "root": tree[0] if tree else None
         }
     except Exception as e:
@@ -198,38 +241,54 @@ def find_tree_issues(tree: Tree) -> list:
         True
     """
     issues = []
-    
-    if tree is None:
-        issues.append("Tree is None")
-        return issues
-    
-    if not isinstance(tree, tuple):
-        issues.append(f"Tree must be a tuple, got {type(tree).__name__}")
-        return issues
-    
-    if len(tree) == 0:
-        issues.append("Tree is empty")
-        return issues
-    
-    if len(tree) not in (1, 3):
-        issues.append(
-            f"Tree must have 1 (leaf) or 3 (internal) elements, got {len(tree)}"
-        )
-        return issues
-    
-    # Recursively check subtrees
-    if len(tree) == 3:
-        if tree[1] is not None:
-            left_issues = find_tree_issues(tree[1])
-            issues.extend([f"left subtree: {issue}" for issue in left_issues])
-        
-        if tree[2] is not None:
-            right_issues = find_tree_issues(tree[2])
-            issues.extend([f"right subtree: {issue}" for issue in right_issues])
-    
+
+    # Walk the tree with an explicit stack, left subtree first, so issues
+    # are listed in the same order as a recursive check would find them.
+    # Each entry carries its path as a linked (parent_path, step) pair,
+    # which becomes the "left subtree: " prefixes only for reported issues.
+    # As in _check, the inner loop moves straight on to the left child and
+    # only right children wait on the stack.
+    stack = [(tree, None)]
+    while stack:
+        t, path = stack.pop()
+        while True:
+            issue = None
+            left = None
+
+            if t is None:
+                issue = "Tree is None"
+            elif not isinstance(t, tuple):
+                issue = _TYPE_ISSUE(type(t).__name__)
+            elif not t:
+                # An empty subtree below a node is fine
+                if path is None:
+                    issue = "Tree is empty"
+            elif len(t) not in (1, 3):
+                issue = _SIZE_ISSUE(len(t))
+            elif len(t) == 3:
+                # Right subtree waits; the left subtree is checked next
+                _, left, right = t
+                if right is not None:
+                    stack.append((right, (path, "right")))
+
+            if issue is not None:
+                issues.append(_issue_prefix(path) + issue)
+            if left is None:
+                break
+            t, path = left, (path, "left")
+
     return issues
 
 
+def _issue_prefix(path: Optional[tuple]) -> str:
+    """Spells out a (parent_path, step) chain as "left subtree: right subtree: "."""
+    steps = []
+    while path is not None:
+        path, step = path
+        steps.append(step)
+    return "".join(step + " subtree: " for step in reversed(steps))
+
+
 def validate_tree_with_suggestions(tree: Tree) -> Dict[str, Any]:
     """Validates tree and provides suggestions for fixing issues.
     
@@ -292,6 +351,7 @@ if __name__ == "__main__":
     valid_trees = [
         ('A', (), ()),  # Leaf
         ('A', ('B', (), ()), ('C', (), ())),  # Simple tree
+        ('A', ('B',), ('C',)),  # Leaves written as (name,)
     ]
     
     for tree in valid_trees:
@@ -314,7 +374,7 @@ if __name__ == "__main__":
         [],
         (),
         ('A', 'B', 'C', 'D'),
-        ('A', ('B',), ('C',)),  # Left subtree has wrong structure
+        ('A', ('B', 'C'), ()),  # Left subtree has wrong structure
     ]
     
     for tree in invalid_trees: